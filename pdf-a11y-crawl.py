@@ -3,25 +3,78 @@ import argparse
 import csv
 import hashlib
 import json
+import multiprocessing
 import os
+import queue
 import re
+import shelve
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass, asdict
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, fields
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from urllib.parse import urljoin, urlparse, urldefrag
+from urllib.robotparser import RobotFileParser
 
+import lxml.etree
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+import requests.adapters
 from tqdm import tqdm
 
+try:
+    import orjson  # optional: faster report serialization
+except ImportError:
+    orjson = None
+
+try:
+    import pymupdf  # optional: in-process fonts/text instead of poppler subprocesses
+except ImportError:
+    pymupdf = None
+
 __version__ = "0.1.2"
 
 PDF_RE = re.compile(r"\.pdf(\?|#|$)", re.IGNORECASE)
 
+# A pdffonts font row: any non-blank line other than the "name ..." header and "---" rule
+FONT_ROW_RE = re.compile(rb"^(?!name\b|---)\S", re.MULTILINE | re.IGNORECASE)
+
+# <a href=... type="application/pdf"> (case-insensitive type match)
+PDF_TYPE_XPATH = (
+    "//a[contains(translate(@type, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'),"
+    " 'application/pdf')]/@href"
+)
+
+# fetch_html() has already decoded the page, so always feed lxml UTF-8 bytes
+HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Concurrent page fetches / PDF downloads (the crawl is I/O-bound)
+PAGE_WORKERS = 16
+DOWNLOAD_WORKERS = 4
+
+# Politeness: requests in flight per host, and retries on 429/503
+PER_HOST_LIMIT = 4
+MAX_RETRIES = 3
+MAX_RETRY_WAIT = 60
+
+USER_AGENT = "pdf-a11y-crawler/0.1"
+
+# Read size for PDF downloads; large reads keep the per-chunk Python work small
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+
+# PDFs per veraPDF invocation (one JVM start per batch)
+VERA_BATCH_SIZE = 64
 
-@dataclass
+# With --skip-vera-image-only, image-only PDFs above this size skip veraPDF
+VERA_IMAGE_ONLY_SKIP_BYTES = 20_000_000
+
+
+@dataclass(slots=True)
 class PdfResult:
     pdf_url: str
     source_page: str
@@ -29,7 +82,7 @@ class PdfResult:
     content_type: str | None
     bytes_downloaded: int | None
     sha256: str | None
-    has_text_layer: bool | None          # True if fonts found via pdffonts
+    has_text_layer: bool | None          # True if fonts found via PyMuPDF / pdffonts
     fonts_count: int | None
     pdftotext_ran: bool
     pdftotext_ok: bool | None
@@ -42,15 +95,32 @@ class PdfResult:
     notes: str | None
 
 
-def same_origin(a: str, b: str) -> bool:
-    pa, pb = urlparse(a), urlparse(b)
-    return (pa.scheme, pa.netloc) == (pb.scheme, pb.netloc)
+# Report column order
+PDF_RESULT_FIELDS = tuple(f.name for f in fields(PdfResult))
+
+
+def dumps_json(row: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row)
+    return json.dumps(row, ensure_ascii=False).encode("utf-8")
+
+
+def origin_key(url: str) -> tuple[str, str]:
+    p = urlparse(url)
+    return (p.scheme, p.netloc)
+
+
+def url_key(url: str) -> bytes:
+    # 16-byte digest used in the crawl's dedup sets; much smaller than the URL
+    # itself on large crawls, and collisions are negligible at 128 bits
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
 
 
 def normalize_url(base: str, href: str) -> str | None:
     if not href:
         return None
-    u = urljoin(base, href)
+    # Absolute links don't need resolving against the page URL
+    u = href if href.startswith(("http://", "https://")) else urljoin(base, href)
     u, _frag = urldefrag(u)
     return u
 
@@ -77,23 +147,15 @@ def run_pdffonts(pdf_path: Path) -> tuple[bool, int, str | None]:
         p = subprocess.run(
             ["pdffonts", str(pdf_path)],
             capture_output=True,
-            text=True,
             timeout=30,
             check=False,
         )
         if p.returncode != 0:
-            return (None, None, f"pdffonts failed: {p.stderr.strip()[:200]}")  # type: ignore
+            return (None, None, f"pdffonts failed: {p.stderr.decode('utf-8', errors='replace').strip()[:200]}")  # type: ignore
 
-        lines = [ln for ln in p.stdout.splitlines() if ln.strip()]
         # Typical output includes two header lines, then rows. If no fonts, only headers or nothing.
-        # Heuristic: count rows after a separator line of dashes, or simply count non-header rows.
-        # We'll treat any line that doesn't start with 'name' or '---' as a font row.
-        font_rows = [
-            ln for ln in lines
-            if not ln.lower().startswith("name")
-            and not ln.startswith("---")
-        ]
-        fonts_count = len(font_rows)
+        # Count rows in one pass over the raw bytes.
+        fonts_count = len(FONT_ROW_RE.findall(p.stdout))
         return (fonts_count > 0, fonts_count, None)
 
     except subprocess.TimeoutExpired:
@@ -102,62 +164,218 @@ def run_pdffonts(pdf_path: Path) -> tuple[bool, int, str | None]:
         return (None, None, f"pdffonts exception: {e}")  # type: ignore
 
 
-def run_pdftotext(pdf_path: Path, out_txt: Path, timeout: int = 120):
+def analyze_with_pymupdf(pdf_path: Path, extract_text: bool) -> tuple[bool, int, str | None]:
+    """
+    Returns: (has_text_layer, fonts_count, text)
+    Opens the PDF once for both font enumeration and (optional) text extraction.
+    fonts_count counts distinct font objects, like pdffonts; text is only
+    extracted when requested and fonts were found. Raises on unreadable PDFs.
+    """
+    with pymupdf.open(pdf_path) as doc:
+        fonts = {f[0] for page in doc for f in page.get_fonts()}
+        fonts_count = len(fonts)
+        text = None
+        if extract_text and fonts_count > 0:
+            # Form feed between pages, as pdftotext does
+            text = chr(12).join(page.get_text() for page in doc)
+    return (fonts_count > 0, fonts_count, text)
+
+
+def run_pdftotext(pdf_path: Path, out_txt: Path, timeout: int = 120) -> tuple[bool, str | None, bytes | None]:
+    """
+    Returns: (ok, error, text_bytes)
+    pdftotext writes to stdout; the captured UTF-8 bytes are saved to out_txt
+    and returned, so callers don't have to read the file back.
+    """
     if shutil.which("pdftotext") is None:
-        return False, "pdftotext not installed"
+        return False, "pdftotext not installed", None
 
     try:
         p = subprocess.run(
-            ["pdftotext", "-layout", "-enc", "UTF-8", str(pdf_path), str(out_txt)],
+            ["pdftotext", "-layout", "-enc", "UTF-8", str(pdf_path), "-"],
             capture_output=True,
-            text=True,
             timeout=timeout
         )
         if p.returncode != 0:
-            return False, p.stderr.strip()
-        return True, None
+            return False, p.stderr.decode("utf-8", errors="replace").strip(), None
+        out_txt.write_bytes(p.stdout)
+        return True, None, p.stdout
     except Exception as e:
-        return False, str(e)
+        return False, str(e), None
 
 
-def run_verapdf(pdf_path: Path) -> tuple[bool, bool | None, str | None]:
+def run_verapdf_batch(pdf_paths: list[Path], timeout: int = 120) -> dict[Path, tuple[bool, bool | None, str | None]]:
     """
-    Returns: (ran, passed?, note)
-    veraPDF output/return codes can vary by package; we use a simple heuristic:
-    - If it runs and output contains 'PASS' (case-insensitive) and not 'FAIL', treat as pass.
+    Validate many PDFs with a single veraPDF run, so the JVM starts once per batch.
+    Returns: {pdf_path: (ran, passed?, note)}
+    passed is each file's isCompliant verdict from the XML report; timeout is per PDF.
+    The report is read as it streams, and the run is killed once no file's report
+    arrives within timeout; the file it was stuck on is marked timed out and the
+    rest go to a fresh batch.
     """
     if shutil.which("verapdf") is None:
-        return (False, None, None)
+        return {path: (False, None, None) for path in pdf_paths}
+
+    by_name = {str(path.resolve()): path for path in pdf_paths}
+    by_basename = {path.name: path for path in pdf_paths}
 
     try:
-        p = subprocess.run(
-            ["verapdf", "--flavour", "ua1", "--format", "text", str(pdf_path)],
-            capture_output=True,
-            text=True,
-            timeout=120,
-            check=False,
+        p = subprocess.Popen(
+            # Only pass/fail is reported, so stop validating at the first failed check
+            ["verapdf", "--flavour", "ua1", "--format", "xml", "--maxfailures", "1", *by_name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
         )
-        out = (p.stdout + "\n" + p.stderr).lower()
-        # Heuristic: look for pass/fail tokens.
-        passed = None
-        if "pass" in out and "fail" not in out:
-            passed = True
-        if "fail" in out:
-            passed = False
-        note = None
-        if p.returncode != 0 and passed is None:
-            note = f"verapdf return code {p.returncode}"
-        return (True, passed, note)
-
-    except subprocess.TimeoutExpired:
-        return (True, None, "verapdf timed out")
     except Exception as e:
-        return (True, None, f"verapdf exception: {e}")
+        return {path: (True, None, f"verapdf exception: {e}") for path in pdf_paths}
+
+    # A reader thread lets the wait for the next chunk time out
+    chunks: queue.Queue[bytes] = queue.Queue()
+
+    def pump() -> None:
+        with p.stdout:
+            while chunk := p.stdout.read1(65536):
+                chunks.put(chunk)
+        chunks.put(b"")
+
+    threading.Thread(target=pump, daemon=True).start()
+
+    # One <job> per input file: <item><name>path</name></item> plus either
+    # a <validationReport isCompliant="..."> or a <taskException>.
+    parser = lxml.etree.XMLPullParser(events=("end",), tag="job")
+    xml_ok = True
+    timed_out = False
+    results = {}
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            chunk = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Empty:
+            p.kill()
+            timed_out = True
+            break
+        if not chunk:
+            break
+        if not xml_ok:
+            continue
+        try:
+            parser.feed(chunk)
+            for _event, job in parser.read_events():
+                name = job.findtext("item/name") or ""
+                path = by_name.get(name) or by_basename.get(Path(name).name)
+                report = job.find("validationReport")
+                if path is not None:
+                    if report is not None:
+                        passed = {"true": True, "false": False}.get(report.get("isCompliant"))
+                        results[path] = (True, passed, None)
+                    else:
+                        results[path] = (True, None, "verapdf could not validate file")
+                job.clear()
+                # Each finished report restarts the clock for the next file
+                deadline = time.monotonic() + timeout
+        except lxml.etree.XMLSyntaxError:
+            # Keep draining stdout so veraPDF can exit; reports so far still count
+            xml_ok = False
+    returncode = p.wait()
+
+    pending = [path for path in pdf_paths if path not in results]
+    if timed_out and pending:
+        # Files are validated in argument order, so the first one without a report is the stuck one
+        results[pending[0]] = (True, None, "verapdf timed out")
+        if pending[1:]:
+            results.update(run_verapdf_batch(pending[1:], timeout))
+    for path in pending:
+        results.setdefault(path, (True, None, f"verapdf return code {returncode}, no report"))
+    return results
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value.strip())
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
 
 
-def fetch_html(session: requests.Session, url: str, timeout: int) -> tuple[int | None, str | None, str | None]:
+class CrawlSession(requests.Session):
+    """
+    Keep-alive session shared by all worker threads, adding politeness:
+    - host_slot(url): at most per_host requests in flight to any one host,
+      so overall concurrency can be raised without hammering a single site
+    - 429/503 replies are retried with backoff, honoring Retry-After
+    - allowed(url): robots.txt check (cached per origin)
+    """
+
+    def __init__(self, per_host: int, honor_robots: bool = True):
+        super().__init__()
+        self.headers["User-Agent"] = USER_AGENT
+        # Keep as many idle connections per host as may be in flight to it
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=per_host)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        self.per_host = per_host
+        self.honor_robots = honor_robots
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._robots: dict[tuple[str, str], RobotFileParser | None] = {}
+
+    def host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(MAX_RETRIES + 1):
+            r = super().request(method, url, *args, **kwargs)
+            if r.status_code not in (429, 503) or attempt == MAX_RETRIES:
+                return r
+            delay = retry_after_seconds(r.headers.get("Retry-After"))
+            r.close()
+            time.sleep(min(delay if delay is not None else 2 ** attempt, MAX_RETRY_WAIT))
+        return r
+
+    def allowed(self, url: str) -> bool:
+        if not self.honor_robots:
+            return True
+        key = origin_key(url)
+        with self._lock:
+            known = key in self._robots
+            rp = self._robots.get(key)
+        if not known:
+            rp = self._fetch_robots(key)
+            with self._lock:
+                self._robots[key] = rp
+        return rp is None or rp.can_fetch(USER_AGENT, url)
+
+    def _fetch_robots(self, key: tuple[str, str]) -> RobotFileParser | None:
+        # Same rules as RobotFileParser.read(): 401/403 => disallow all,
+        # other errors (or no robots.txt) => allow all (None)
+        rp = RobotFileParser()
+        try:
+            r = self.get(f"{key[0]}://{key[1]}/robots.txt", timeout=10)
+        except Exception:
+            return None
+        if r.status_code in (401, 403):
+            rp.disallow_all = True
+        elif r.status_code >= 400:
+            return None
+        else:
+            rp.parse(r.text.splitlines())
+        return rp
+
+
+def fetch_html(session: CrawlSession, url: str, timeout: int) -> tuple[int | None, str | None, str | None]:
     try:
-        r = session.get(url, timeout=timeout, allow_redirects=True, headers={"User-Agent": "pdf-a11y-crawler/0.1"})
+        with session.host_slot(url):
+            r = session.get(url, timeout=timeout, allow_redirects=True)
         ct = r.headers.get("Content-Type", "")
         if r.status_code >= 400:
             return (r.status_code, ct, None)
@@ -169,51 +387,462 @@ def fetch_html(session: requests.Session, url: str, timeout: int) -> tuple[int |
         return (None, None, None)
 
 
-def download_pdf(session: requests.Session, url: str, out_path: Path, timeout: int, max_bytes: int) -> tuple[int | None, str | None, int | None, str | None]:
+def download_pdf(session: CrawlSession, url: str, out_path: Path, timeout: int, max_bytes: int, headers: dict | None = None) -> tuple[int | None, str | None, int | None, str | None, dict]:
     """
-    Returns: (status, content_type, bytes_downloaded, note)
+    Returns: (status, content_type, bytes_downloaded, note, validators)
+    validators holds the response ETag / Last-Modified (if any) for conditional re-downloads.
+    A 304 reply (when headers carry If-None-Match / If-Modified-Since) writes nothing.
     """
     try:
-        with session.get(url, timeout=timeout, stream=True, allow_redirects=True, headers={"User-Agent": "pdf-a11y-crawler/0.1"}) as r:
+        with session.host_slot(url), session.get(url, timeout=timeout, stream=True, allow_redirects=True, headers=headers) as r:
             ct = r.headers.get("Content-Type", "")
             status = r.status_code
+            validators = {k: r.headers[k] for k in ("ETag", "Last-Modified") if k in r.headers}
             if status >= 400:
-                return (status, ct, None, f"HTTP {status}")
+                return (status, ct, None, f"HTTP {status}", validators)
+            if status == 304:
+                return (status, ct, None, "not modified", validators)
 
             # Some servers mislabel; accept if URL ends with .pdf OR content-type suggests PDF.
             if ("application/pdf" not in ct.lower()) and (not is_probably_pdf(url)):
                 # still download a small chunk to decide? We'll just note it.
                 pass
 
+            # Oversized PDFs that announce their size are rejected before any body is read
+            cl = r.headers.get("Content-Length", "")
+            if cl.isdigit() and int(cl) > max_bytes:
+                return (status, ct, None, f"exceeded max_bytes={max_bytes} (Content-Length {cl})", validators)
+
             out_path.parent.mkdir(parents=True, exist_ok=True)
             total = 0
             h = hashlib.sha256()
+            head = b""
 
+            # Single pass over the stream: each block is written and hashed as
+            # it arrives, so the file is never read back. Never read more than
+            # max_bytes + 1.
+            r.raw.decode_content = True
             with open(out_path, "wb") as f:
-                for chunk in r.iter_content(chunk_size=1024 * 64):
-                    if not chunk:
-                        continue
-                    total += len(chunk)
+                while True:
+                    # The first KiB is read on its own so non-PDFs stop right after it
+                    want = DOWNLOAD_CHUNK_BYTES if len(head) >= 1024 else 1024 - len(head)
+                    block = r.raw.read(min(want, max_bytes + 1 - total))
+                    if not block:
+                        break
+                    total += len(block)
                     if total > max_bytes:
-                        return (status, ct, total, f"exceeded max_bytes={max_bytes}")
-                    f.write(chunk)
-                    h.update(chunk)
-
-            return (status, ct, total, h.hexdigest())
+                        return (status, ct, total, f"exceeded max_bytes={max_bytes}", validators)
+                    if len(head) < 1024:
+                        head += block
+                        # The header may follow some leading junk, which readers tolerate
+                        if len(head) == 1024 and b"%PDF-" not in head:
+                            # e.g. an HTML error page served with a 200; stop downloading it
+                            return (status, ct, total, "not a PDF (no %PDF- header)", validators)
+                    f.write(block)
+                    h.update(block)
+
+            digest = h.hexdigest()
+            if b"%PDF-" not in head:
+                # Shorter than 1 KiB and still no header
+                return (status, ct, total, "not a PDF (no %PDF- header)", validators)
+
+            return (status, ct, total, digest, validators)
 
     except Exception as e:
-        return (None, None, None, f"download exception: {e}")
+        return (None, None, None, f"download exception: {e}", {})
 
 
-def extract_links(html: str, base_url: str) -> list[str]:
-    soup = BeautifulSoup(html, "lxml")
+def extract_links(html: str, base_url: str) -> tuple[list[str], set[str]]:
+    """
+    Returns: (links, typed_pdfs)
+    typed_pdfs are the links whose <a type="..."> declares application/pdf.
+    """
+    try:
+        doc = lxml.html.fromstring(html.encode("utf-8", errors="replace"), parser=HTML_PARSER)
+    except lxml.etree.ParserError:
+        # e.g. whitespace-only body
+        return ([], set())
+    # Plain str results: lxml's default "smart" strings keep the whole page tree alive
     hrefs = []
-    for a in soup.find_all("a"):
-        href = a.get("href")
+    for href in doc.xpath("//a/@href", smart_strings=False):
         u = normalize_url(base_url, href)
         if u:
             hrefs.append(u)
-    return hrefs
+    typed_pdfs = set()
+    for href in doc.xpath(PDF_TYPE_XPATH, smart_strings=False):
+        u = normalize_url(base_url, href)
+        if u:
+            typed_pdfs.add(u)
+    return (hrefs, typed_pdfs)
+
+
+def probe_pdf(session: CrawlSession, url: str, timeout: int) -> bool | None:
+    """
+    Fetch only the first KiB of url and look for the %PDF- header.
+    Returns None if the probe itself failed, so the caller can still try a full download.
+    """
+    try:
+        with session.host_slot(url), session.get(url, timeout=timeout, stream=True, allow_redirects=True, headers={"Range": "bytes=0-1023"}) as r:
+            if r.status_code >= 400:
+                return None
+            r.raw.decode_content = True
+            # The header may follow some leading junk, which readers tolerate
+            return b"%PDF-" in r.raw.read(1024)
+    except Exception:
+        return None
+
+
+class AnalyzerCache:
+    """
+    Persistent (shelve) cache shared across crawls:
+    - "analysis:<pdftotext 0/1>:<sha256>" -> analyzer fields, so identical PDFs are analyzed once
+    - "text:<sha256>" -> path of the last extracted text file for that PDF
+    - "verapdf:<sha256>" -> veraPDF pass/fail verdict
+    - "url:<url>" -> validators/sha256 of the last download, for conditional GETs
+    Download threads share one instance, so access is serialized.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = shelve.open(str(path))
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            return self._db.get(key)
+
+    def put(self, key: str, value) -> None:
+        with self._lock:
+            self._db[key] = value
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# Analyzer fields for a PDF that could not be analyzed (e.g. download failed)
+NO_ANALYSIS = {
+    "has_text_layer": None,
+    "fonts_count": None,
+    "pdftotext_ran": False,
+    "pdftotext_ok": None,
+    "pdftotext_output": None,
+    "pdftotext_bytes": None,
+    "pdftotext_chars": None,
+    "notes": None,
+}
+
+
+def analyze_pdf(pdf_path: Path, pdftotext: bool) -> dict:
+    """
+    Detect a text layer and optionally extract text.
+    Uses PyMuPDF in-process when available, falling back to pdffonts/pdftotext.
+    Runs in a worker process; returns a dict of PdfResult analyzer fields.
+    """
+    note = None
+
+    pdftotext_ran = False
+    pdftotext_ok = None
+    pdftotext_output = None
+    pdftotext_bytes = None
+    pdftotext_chars = None
+    txt_path = pdf_path.with_suffix(".pdftotext.txt")
+
+    text = None
+    used_pymupdf = False
+    if pymupdf is not None:
+        try:
+            has_text_layer, fonts_count, text = analyze_with_pymupdf(pdf_path, extract_text=pdftotext)
+            used_pymupdf = True
+        except Exception as e:
+            note = f"pymupdf failed ({e}), using poppler"
+
+    if used_pymupdf:
+        # Optional: extract text for review
+        if text is not None:
+            pdftotext_ran = True
+            try:
+                data = text.encode("utf-8", errors="replace")
+                txt_path.write_bytes(data)
+                pdftotext_ok = True
+                pdftotext_output = str(txt_path)
+                pdftotext_chars = len(text)
+                pdftotext_bytes = len(data)
+            except Exception as e:
+                pdftotext_ok = False
+                note = (note + "; " if note else "") + f"text write failed: {e}"
+    else:
+        has_text_layer, fonts_count, pdffonts_note = run_pdffonts(pdf_path)
+        if pdffonts_note:
+            note = (note + "; " if note else "") + pdffonts_note
+
+        # Optional: extract text for review
+        if pdftotext and has_text_layer and pdf_path.exists():
+            pdftotext_ran = True
+            ok, err, data = run_pdftotext(pdf_path, txt_path)
+            pdftotext_ok = ok
+            pdftotext_output = str(txt_path) if ok else None
+            if ok:
+                pdftotext_bytes = len(data)
+                pdftotext_chars = len(data.decode("utf-8", errors="replace"))
+            else:
+                note = (note + "; " if note else "") + f"pdftotext failed: {err}"
+
+    return {
+        "has_text_layer": has_text_layer,
+        "fonts_count": fonts_count,
+        "pdftotext_ran": pdftotext_ran,
+        "pdftotext_ok": pdftotext_ok,
+        "pdftotext_output": pdftotext_output,
+        "pdftotext_bytes": pdftotext_bytes,
+        "pdftotext_chars": pdftotext_chars,
+        "notes": note,
+    }
+
+
+@dataclass(slots=True)
+class PdfDownload:
+    """Outcome of process_pdf() for one PDF link, before analysis."""
+    pdf_url: str
+    source_page: str
+    pdf_path: Path
+    http_status: int | None
+    content_type: str | None
+    bytes_downloaded: int | None
+    sha256: str | None
+    notes: str | None
+    analysis: dict | None                # analyzer fields; None => analyze_pdf() still has to run
+
+
+def analysis_key(pdftotext: bool, sha256: str) -> str:
+    # Cached analysis depends on whether text extraction was requested
+    return f"analysis:{pdftotext:d}:{sha256}"
+
+
+def cached_analysis(cache: AnalyzerCache, pdftotext: bool, sha256: str) -> dict | None:
+    """
+    Cached analyzer fields for a PDF, or None if it has to be analyzed again.
+    pdftotext_output isn't cached: extracted text lives in the run directory
+    that wrote it, so a missing text file counts as a miss.
+    """
+    analysis = cache.get(analysis_key(pdftotext, sha256))
+    if analysis is not None and analysis["pdftotext_ok"]:
+        text_path = cache.get(f"text:{sha256}")
+        if text_path is None or not Path(text_path).exists():
+            return None
+    return analysis
+
+
+def process_pdf(
+    session: CrawlSession,
+    cache: AnalyzerCache | None,
+    link: str,
+    page_url: str,
+    out_dir: Path,
+    timeout: int,
+    max_bytes: int,
+    run_vera: bool,
+    pdftotext: bool,
+    probe: bool,
+) -> PdfDownload:
+    """
+    Download a single PDF and look up cached analysis for it.
+    Runs on a download worker thread, so it must not touch crawl state;
+    crawl() submits the analysis itself so downloads never wait on analyzers.
+    """
+    dl_status = None
+    dl_ct = None
+    dl_bytes = None
+    sha256 = None
+    note = None
+
+    pdf_path = out_dir / "pdfs" / safe_filename_from_url(link)
+
+    # Only ask for a 304 if we could still report the PDF from cache
+    prev = None
+    cond_headers = {}
+    if cache is not None:
+        prev = cache.get(f"url:{link}")
+        if (
+            prev
+            and cached_analysis(cache, pdftotext, prev["sha256"]) is not None
+            and (not run_vera or cache.get(f"verapdf:{prev['sha256']}") is not None)
+        ):
+            if "ETag" in prev["validators"]:
+                cond_headers["If-None-Match"] = prev["validators"]["ETag"]
+            if "Last-Modified" in prev["validators"]:
+                cond_headers["If-Modified-Since"] = prev["validators"]["Last-Modified"]
+
+    # A URL already known (cached) to be a PDF doesn't need probing
+    validators = {}
+    if not session.allowed(link):
+        note = "disallowed by robots.txt"
+    elif probe and not cond_headers and probe_pdf(session, link, timeout) is False:
+        note = "not a PDF (probe)"
+    else:
+        dl_status, dl_ct, dl_bytes, dl_note_or_sha, validators = download_pdf(
+            session, link, pdf_path,
+            timeout=timeout,
+            max_bytes=max_bytes,
+            headers=cond_headers,
+        )
+
+        if dl_status is None:
+            note = dl_note_or_sha
+        elif dl_status == 304 and prev:
+            dl_ct = prev["content_type"]
+            dl_bytes = prev["bytes_downloaded"]
+            sha256 = prev["sha256"]
+            note = "not modified since last crawl"
+        else:
+            if dl_note_or_sha and re.fullmatch(r"[0-9a-f]{64}", dl_note_or_sha):
+                sha256 = dl_note_or_sha
+            else:
+                note = dl_note_or_sha
+
+    if cache is not None and sha256 and dl_status == 200:
+        cache.put(f"url:{link}", {
+            "validators": validators,
+            "sha256": sha256,
+            "content_type": dl_ct,
+            "bytes_downloaded": dl_bytes,
+        })
+
+    # Only complete downloads get analyzed
+    analysis = dict(NO_ANALYSIS)
+    if sha256:
+        cached = cached_analysis(cache, pdftotext, sha256) if cache is not None else None
+        analysis = dict(cached) if cached is not None else None
+        # Copy the earlier text into this run's pdfs/ so the report points inside it
+        if analysis is not None and analysis["pdftotext_ok"]:
+            txt_path = pdf_path.with_suffix(".pdftotext.txt")
+            try:
+                prev_txt = Path(cache.get(f"text:{sha256}"))
+                if prev_txt != txt_path:
+                    txt_path.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(prev_txt, txt_path)
+                analysis["pdftotext_output"] = str(txt_path)
+                cache.put(f"text:{sha256}", str(txt_path))
+            except OSError:
+                # Re-extract when the PDF is on disk; a 304 has nothing to extract from
+                if dl_status == 200:
+                    analysis = None
+                else:
+                    analysis["pdftotext_ok"] = False
+                    note = (note + "; " if note else "") + "cached text no longer available"
+
+    return PdfDownload(
+        pdf_url=link,
+        source_page=page_url,
+        pdf_path=pdf_path,
+        http_status=dl_status,
+        content_type=dl_ct,
+        bytes_downloaded=dl_bytes,
+        sha256=sha256,
+        notes=note,
+        analysis=analysis,
+    )
+
+
+def build_result(
+    dl: PdfDownload,
+    analysis: dict,
+    cache: AnalyzerCache | None,
+    run_vera: bool,
+    skip_vera_image_only: bool,
+) -> tuple[PdfResult, Path | None]:
+    """
+    Combine a download with its analyzer fields into a PdfResult.
+    Returns: (result, vera_path) -- vera_path is set when the PDF still needs
+    veraPDF, which crawl() runs in batches.
+    """
+    analysis = dict(analysis)
+    note = dl.notes
+    analysis_note = analysis.pop("notes")
+    if analysis_note:
+        note = (note + "; " if note else "") + analysis_note
+
+    ver_ran = False
+    ver_passed = None
+    vera_path = None
+    if run_vera and dl.sha256:
+        cached_vera = cache.get(f"verapdf:{dl.sha256}") if cache is not None else None
+        if cached_vera is not None:
+            ver_ran, ver_passed = True, cached_vera
+        # Large scans have no text to check and can stall veraPDF for minutes
+        elif skip_vera_image_only and analysis["has_text_layer"] is False and (dl.bytes_downloaded or 0) > VERA_IMAGE_ONLY_SKIP_BYTES:
+            note = (note + "; " if note else "") + "verapdf skipped: large image-only PDF"
+        else:
+            vera_path = dl.pdf_path
+
+    text_density = None
+    if analysis["pdftotext_bytes"] is not None and dl.bytes_downloaded:
+        text_density = analysis["pdftotext_bytes"] / dl.bytes_downloaded
+
+    result = PdfResult(
+        pdf_url=dl.pdf_url,
+        source_page=dl.source_page,
+        http_status=dl.http_status,
+        content_type=dl.content_type,
+        bytes_downloaded=dl.bytes_downloaded,
+        sha256=dl.sha256,
+        text_density=text_density,
+        verapdf_ran=ver_ran,
+        verapdf_passed=ver_passed,
+        notes=note,
+        **analysis,
+    )
+    return (result, vera_path)
+
+
+class ReportWriter:
+    """
+    Streams PdfResult rows to report.csv / report.jsonl as they are produced,
+    so memory use does not grow with the crawl. report.json (one array) is
+    assembled from report.jsonl on close(). Rows are flushed as written, so an
+    interrupted crawl still leaves everything reported so far on disk.
+    Only used from the main thread.
+    """
+
+    def __init__(self, out_dir: Path):
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.csv_path = out_dir / "report.csv"
+        self.jsonl_path = out_dir / "report.jsonl"
+        self.json_path = out_dir / "report.json"
+
+        self._csv_f = open(self.csv_path, "w", newline="", encoding="utf-8")
+        self._csv = csv.writer(self._csv_f)
+        self._csv.writerow(PDF_RESULT_FIELDS)
+        self._jsonl_f = open(self.jsonl_path, "wb")
+
+        # Running totals for the end-of-run summary
+        self.total = 0
+        self.text_based = 0
+        self.image_only = 0
+
+    def write(self, r: PdfResult) -> None:
+        row = [getattr(r, k) for k in PDF_RESULT_FIELDS]
+        self._csv.writerow(row)
+        self._jsonl_f.write(dumps_json(dict(zip(PDF_RESULT_FIELDS, row))))
+        self._jsonl_f.write(b"\n")
+        self._csv_f.flush()
+        self._jsonl_f.flush()
+
+        self.total += 1
+        if r.has_text_layer is True:
+            self.text_based += 1
+        elif r.has_text_layer is False:
+            self.image_only += 1
+
+    def close(self) -> None:
+        self._csv_f.close()
+        self._jsonl_f.close()
+        with open(self.jsonl_path, "rb") as src, open(self.json_path, "wb") as dst:
+            dst.write(b"[")
+            for i, line in enumerate(src):
+                dst.write(b",\n" if i else b"\n")
+                dst.write(line.rstrip(b"\n"))
+            dst.write(b"\n]\n")
 
 
 def crawl(
@@ -223,177 +852,194 @@ def crawl(
     timeout: int,
     max_bytes: int,
     out_dir: Path,
+    report: ReportWriter,
     include_external_pdfs: bool,
     run_vera: bool,
     pdftotext: bool,
     dry_run=False,
-) -> list[PdfResult]:
-    session = requests.Session()
-
-    seen_pages: set[str] = set()
-    seen_pdfs: set[str] = set()
-    queue: list[str] = [start_url]
-
-    results: list[PdfResult] = []
-
-    with tqdm(total=max_pages if recursive else 1, desc="Crawling pages", unit="page") as bar:
-        while queue and (len(seen_pages) < max_pages):
-            page_url = queue.pop(0)
-            if page_url in seen_pages:
-                continue
-            seen_pages.add(page_url)
-            bar.update(1)
-
-            status, ct, html = fetch_html(session, page_url, timeout)
-            if not html:
-                continue
-
-            links = extract_links(html, page_url)
-
-            for link in links:
-                # Collect PDFs
-                if is_probably_pdf(link):
-                    # Always define these so they exist
-                    dl_status = None
-                    dl_ct = None
-                    dl_bytes = None
-                    sha256 = None
-                    note = None
-
-                    if dry_run:
-                        results.append(
-                            PdfResult(
-                                pdf_url=link,
-                                source_page=page_url,
-                                http_status=None,
-                                content_type=None,
-                                bytes_downloaded=None,
-                                sha256=None,
-                                has_text_layer=None,
-                                fonts_count=None,
-                                pdftotext_ran=False,
-                                pdftotext_ok=None,
-                                pdftotext_output=None,
-                                pdftotext_bytes=None,
-                                pdftotext_chars=None,
-                                text_density=None,
-                                verapdf_ran=False,
-                                verapdf_passed=None,
-                                notes="dry-run (not downloaded)"
+    use_cache=True,
+    vera_timeout=120,
+    skip_vera_image_only=False,
+    probe=False,
+    workers=PAGE_WORKERS,
+    per_host=PER_HOST_LIMIT,
+    honor_robots=True,
+) -> None:
+    session = CrawlSession(per_host=per_host, honor_robots=honor_robots)
+    # Lives next to the per-run output dirs so it persists across crawls
+    cache = AnalyzerCache(out_dir.parent / "analyzer_cache.db") if (use_cache and not dry_run) else None
+
+    pages_crawled = 0
+    # Dedup sets hold url_key() digests rather than full URL strings
+    seen_pdfs: set[bytes] = set()
+    queue: deque[str] = deque([start_url])
+    # Pages are deduplicated when queued, so the frontier never holds repeats
+    queued: set[bytes] = {url_key(start_url)}
+    start_key = origin_key(start_url)
+
+    pdf_futures: set[Future] = set()
+    # Analyses run on all cores, submitted here as downloads complete
+    analysis_futures: dict[Future, PdfDownload] = {}
+    # PDFs waiting for veraPDF, and submitted veraPDF batches
+    vera_pending: list[tuple[PdfResult, Path]] = []
+    vera_futures: dict[Future, list[tuple[PdfResult, Path]]] = {}
+
+    def submit_vera_batch() -> None:
+        batch = list(vera_pending)
+        vera_pending.clear()
+        fut = analysis_pool.submit(run_verapdf_batch, [path for _r, path in batch], vera_timeout)
+        vera_futures[fut] = batch
+
+    def finish_pdf(result: PdfResult, vera_path: Path | None) -> None:
+        if vera_path is None:
+            report.write(result)
+            return
+        vera_pending.append((result, vera_path))
+        if len(vera_pending) >= VERA_BATCH_SIZE:
+            submit_vera_batch()
+
+    def finish_download(dl: PdfDownload) -> None:
+        if dl.analysis is None:
+            analysis_futures[analysis_pool.submit(analyze_pdf, dl.pdf_path, pdftotext)] = dl
+        else:
+            finish_pdf(*build_result(dl, dl.analysis, cache, run_vera, skip_vera_image_only))
+
+    def finish_analysis(fut: Future) -> None:
+        dl = analysis_futures.pop(fut)
+        analysis = fut.result()
+        # Don't cache failures (missing tools, timeouts) so a later run can retry
+        if cache is not None and analysis["notes"] is None:
+            cache.put(analysis_key(pdftotext, dl.sha256), {**analysis, "pdftotext_output": None})
+            if analysis["pdftotext_output"]:
+                cache.put(f"text:{dl.sha256}", analysis["pdftotext_output"])
+        finish_pdf(*build_result(dl, analysis, cache, run_vera, skip_vera_image_only))
+
+    def finish_vera_batch(fut: Future) -> None:
+        verdicts = fut.result()
+        for r, path in vera_futures.pop(fut):
+            r.verapdf_ran, r.verapdf_passed, ver_note = verdicts[path]
+            if ver_note:
+                r.notes = (r.notes + "; " if r.notes else "") + ver_note
+            elif cache is not None and r.verapdf_passed is not None:
+                cache.put(f"verapdf:{r.sha256}", r.verapdf_passed)
+            report.write(r)
+
+    # Network latency dominates, so pages are fetched in batches and PDFs
+    # are handed off to their own pool while the crawl keeps going.
+    with (
+        ThreadPoolExecutor(max_workers=workers) as page_pool,
+        ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pdf_pool,
+        # Workers start while the thread pools run, so they must not be forked
+        # from this process; forkserver isn't available on Windows
+        ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            ),
+        ) as analysis_pool,
+        tqdm(total=max_pages if recursive else 1, desc="Crawling pages", unit="page") as bar,
+    ):
+        while queue and (pages_crawled < max_pages):
+            batch: list[str] = []
+            while queue and (pages_crawled + len(batch) < max_pages) and (len(batch) < workers):
+                page_url = queue.popleft()
+                if session.allowed(page_url):
+                    batch.append(page_url)
+                else:
+                    # Say why, or a disallowed start page ends the run with no PDFs and no reason
+                    tqdm.write(f"Skipping {page_url}: disallowed by robots.txt (use --ignore-robots to crawl it)")
+            pages_crawled += len(batch)
+            bar.update(len(batch))
+
+            pages = page_pool.map(lambda u: fetch_html(session, u, timeout), batch)
+
+            for page_url, (status, ct, html) in zip(batch, pages):
+                if not html:
+                    continue
+
+                links, typed_pdfs = extract_links(html, page_url)
+
+                for link in links:
+                    # With --probe, links declared as PDFs are checked even without a .pdf suffix
+                    is_pdf_link = is_probably_pdf(link) or (probe and link in typed_pdfs)
+
+                    # Collect PDFs
+                    if is_pdf_link:
+                        # Each PDF is reported once, from the first page linking to it
+                        pdf_key = url_key(link)
+                        if pdf_key in seen_pdfs:
+                            continue
+                        seen_pdfs.add(pdf_key)
+
+                        if dry_run:
+                            report.write(
+                                PdfResult(
+                                    pdf_url=link,
+                                    source_page=page_url,
+                                    http_status=None,
+                                    content_type=None,
+                                    bytes_downloaded=None,
+                                    sha256=None,
+                                    has_text_layer=None,
+                                    fonts_count=None,
+                                    pdftotext_ran=False,
+                                    pdftotext_ok=None,
+                                    pdftotext_output=None,
+                                    pdftotext_bytes=None,
+                                    pdftotext_chars=None,
+                                    text_density=None,
+                                    verapdf_ran=False,
+                                    verapdf_passed=None,
+                                    notes="dry-run (not downloaded)"
+                                )
+                            )
+                            continue
+
+                        # ---- Normal (non-dry-run) processing ----
+                        pdf_futures.add(
+                            pdf_pool.submit(
+                                process_pdf, session, cache, link, page_url, out_dir,
+                                timeout=timeout,
+                                max_bytes=max_bytes,
+                                run_vera=run_vera,
+                                pdftotext=pdftotext,
+                                probe=probe,
                             )
                         )
-                        continue
-
-                    # ---- Normal (non-dry-run) processing ----
-                    pdf_path = out_dir / "pdfs" / safe_filename_from_url(link)
-
-                    dl_status, dl_ct, dl_bytes, dl_note_or_sha = download_pdf(
-                        session, link, pdf_path,
-                        timeout=timeout,
-                        max_bytes=max_bytes
-                    )
-
-                    if dl_status is None:
-                        note = dl_note_or_sha
-                    else:
-                        if dl_note_or_sha and re.fullmatch(r"[0-9a-f]{64}", dl_note_or_sha):
-                            sha256 = dl_note_or_sha
-                        else:
-                            note = dl_note_or_sha
-
-                    has_text_layer, fonts_count, pdffonts_note = run_pdffonts(pdf_path)
-                    if pdffonts_note:
-                        note = (note + "; " if note else "") + pdffonts_note
-
-                    pdftotext_ran = False
-                    pdftotext_ok = None
-                    pdftotext_output = None
-                    
-                    # Optional: extract text for review
-                    if pdftotext and has_text_layer and pdf_path.exists():
-                        pdftotext_ran = True
-                        txt_path = pdf_path.with_suffix(".pdftotext.txt")
-                        ok, err = run_pdftotext(pdf_path, txt_path)
-                        pdftotext_ok = ok
-                        pdftotext_output = str(txt_path) if ok else None
-                        if not ok:
-                            note = (note + "; " if note else "") + f"pdftotext failed: {err}"
-
-                    pdftotext_bytes = None
-                    pdftotext_chars = None
-                    text_density = None
-
-                    if pdftotext_ok and pdftotext_output and dl_bytes:
-                        txt_p = Path(pdftotext_output)
-                        try:
-                            data = txt_p.read_text(encoding="utf-8", errors="replace")
-                            pdftotext_chars = len(data)
-                            pdftotext_bytes = len(data.encode("utf-8", errors="replace"))
-                            text_density = pdftotext_bytes / dl_bytes if dl_bytes else None
-                        except Exception as e:
-                            note = (note + "; " if note else "") + f"pdftotext read failed: {e}"
-
-                    ver_ran = False
-                    ver_passed = None
-                    if run_vera:
-                        ver_ran, ver_passed, ver_note = run_verapdf(pdf_path)
-                        if ver_note:
-                            note = (note + "; " if note else "") + ver_note
-
-                    results.append(
-                        PdfResult(
-                            pdf_url=link,
-                            source_page=page_url,
-                            http_status=dl_status,
-                            content_type=dl_ct,
-                            bytes_downloaded=dl_bytes,
-                            sha256=sha256,
-                            has_text_layer=has_text_layer,
-                            fonts_count=fonts_count,
-                            pdftotext_ran=pdftotext_ran,
-                            pdftotext_ok=pdftotext_ok,
-                            pdftotext_output=pdftotext_output,
-                            pdftotext_bytes=pdftotext_bytes,
-                            pdftotext_chars=pdftotext_chars,
-                            text_density=text_density,
-                            verapdf_ran=ver_ran,
-                            verapdf_passed=ver_passed,
-                            notes=note
-                        )
-                    )
 
-                # Recurse to other pages
-                if recursive:
-                    if same_origin(start_url, link) and (link not in seen_pages):
-                        # Avoid crawling PDFs as pages
-                        if not is_probably_pdf(link):
-                            queue.append(link)
+                    # Recurse to other pages
+                    if recursive:
+                        link_key = url_key(link)
+                        if (link_key not in queued) and origin_key(link) == start_key:
+                            # Avoid crawling PDFs as pages
+                            if not is_pdf_link:
+                                queued.add(link_key)
+                                queue.append(link)
+
+            # Report PDFs finished so far, so their results aren't held until the end
+            for fut in [f for f in pdf_futures if f.done()]:
+                pdf_futures.remove(fut)
+                finish_download(fut.result())
+            for fut in [f for f in analysis_futures if f.done()]:
+                finish_analysis(fut)
+            for fut in [f for f in vera_futures if f.done()]:
+                finish_vera_batch(fut)
 
             if not recursive:
                 break
 
-    return results
+        for fut in tqdm(as_completed(pdf_futures), total=len(pdf_futures), desc="Downloading PDFs", unit="pdf"):
+            finish_download(fut.result())
+        for fut in tqdm(as_completed(list(analysis_futures)), total=len(analysis_futures), desc="Analyzing PDFs", unit="pdf"):
+            finish_analysis(fut)
 
+        if vera_pending:
+            submit_vera_batch()
+        for fut in tqdm(as_completed(list(vera_futures)), total=len(vera_futures), desc="veraPDF batches", unit="batch"):
+            finish_vera_batch(fut)
 
-def write_reports(results: list[PdfResult], out_dir: Path) -> tuple[Path, Path]:
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    json_path = out_dir / "report.json"
-    csv_path = out_dir / "report.csv"
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in results], f, indent=2)
-
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=list(asdict(results[0]).keys()) if results else [
-            "pdf_url","source_page","http_status","content_type","bytes_downloaded","sha256",
-            "has_text_layer","fonts_count","verapdf_ran","verapdf_passed","notes"
-        ])
-        w.writeheader()
-        for r in results:
-            w.writerow(asdict(r))
-
-    return (csv_path, json_path)
+    if cache is not None:
+        cache.close()
 
 
 def main():
@@ -431,6 +1077,12 @@ def main():
         help="Discover PDFs but do not download or analyze them"
     )
 
+    ap.add_argument(
+        "--ignore-robots",
+        action="store_true",
+        help="Do not check robots.txt before fetching pages and PDFs"
+    )
+
     ap.add_argument(
         "--include-external-pdfs",
         action="store_true",
@@ -451,6 +1103,12 @@ def main():
         help="Maximum number of pages to crawl when using --recursive (default: 200)"
     )
 
+    ap.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-analyze every PDF instead of reusing cached results from earlier runs"
+    )
+
     ap.add_argument(
         "--out",
         default="out",
@@ -463,12 +1121,32 @@ def main():
         help="Dump extracted text for review when text layer is detected"
     )
 
+    ap.add_argument(
+        "--per-host",
+        type=int,
+        default=PER_HOST_LIMIT,
+        help=f"Maximum concurrent requests to any one host (default: {PER_HOST_LIMIT})"
+    )
+
+    ap.add_argument(
+        "--probe",
+        action="store_true",
+        help="Check the first bytes of each PDF link for a PDF header before downloading;\n"
+             "also checks links declared type=\"application/pdf\" without a .pdf suffix"
+    )
+
     ap.add_argument(
         "--recursive",
         action="store_true",
         help="Follow links on the same site (default: off)"
     )
 
+    ap.add_argument(
+        "--skip-vera-image-only",
+        action="store_true",
+        help="Skip veraPDF for image-only PDFs over 20MB (they can stall it for minutes)"
+    )
+
     ap.add_argument(
         "--timeout",
         type=int,
@@ -476,12 +1154,26 @@ def main():
         help="HTTP timeout in seconds (default: 20)"
     )
 
+    ap.add_argument(
+        "--vera-timeout",
+        type=int,
+        default=120,
+        help="veraPDF timeout per PDF in seconds (default: 120)"
+    )
+
     ap.add_argument(
         "--verapdf",
         action="store_true",
         help="Run veraPDF to check PDF/UA compliance (slower)"
     )
 
+    ap.add_argument(
+        "--workers",
+        type=int,
+        default=PAGE_WORKERS,
+        help=f"Pages fetched concurrently across all hosts (default: {PAGE_WORKERS})"
+    )
+
     ap.add_argument(
         "--version",
         action="version",
@@ -493,33 +1185,42 @@ def main():
     timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
     out_dir = Path(args.out) / timestamp
 
-    results = crawl(
-        start_url=args.url,
-        recursive=args.recursive,
-        max_pages=args.max_pages,
-        timeout=args.timeout,
-        max_bytes=args.max_bytes,
-        out_dir=out_dir,
-        include_external_pdfs=args.include_external_pdfs,
-        run_vera=args.verapdf,
-        pdftotext=args.pdftotext,
-        dry_run=args.dry_run,
-    )
+    report = ReportWriter(out_dir)
 
-    csv_path, json_path = write_reports(results, out_dir)
+    # Build report.json from whatever was written, even if the crawl fails
+    try:
+        crawl(
+            start_url=args.url,
+            recursive=args.recursive,
+            max_pages=args.max_pages,
+            timeout=args.timeout,
+            max_bytes=args.max_bytes,
+            out_dir=out_dir,
+            report=report,
+            include_external_pdfs=args.include_external_pdfs,
+            run_vera=args.verapdf,
+            pdftotext=args.pdftotext,
+            dry_run=args.dry_run,
+            use_cache=not args.no_cache,
+            vera_timeout=args.vera_timeout,
+            skip_vera_image_only=args.skip_vera_image_only,
+            probe=args.probe,
+            workers=args.workers,
+            per_host=args.per_host,
+            honor_robots=not args.ignore_robots,
+        )
+    finally:
+        report.close()
 
     # quick summary
-    total = len(results)
-    image_only = sum(1 for r in results if r.has_text_layer is False)
-    text_based = sum(1 for r in results if r.has_text_layer is True)
-    unknown = total - image_only - text_based
+    unknown = report.total - report.image_only - report.text_based
 
     print("\nDone.")
-    print(f"PDFs found: {total}")
-    print(f"Text-based (fonts found): {text_based}")
-    print(f"Image-only (no fonts): {image_only}")
+    print(f"PDFs found: {report.total}")
+    print(f"Text-based (fonts found): {report.text_based}")
+    print(f"Image-only (no fonts): {report.image_only}")
     print(f"Unknown/failed: {unknown}")
-    print(f"\nReports:\n  {csv_path}\n  {json_path}")
+    print(f"\nReports:\n  {report.csv_path}\n  {report.jsonl_path}\n  {report.json_path}")
     if args.dry_run:
         print("\nDry-run complete (no PDFs downloaded).")
 